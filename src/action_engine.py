@@ -47,7 +47,7 @@ else:
 class ActionEngine:
     """Executes approved plans including Emails, Social Posts, CEO Briefings, and JSON Auditing."""
 
-    def __init__(self, vault_path, check_interval=5):
+    def __init__(self, vault_path, check_interval=5, flow=None, sendgrid_client=None, settings=None):
         self.vault_path = Path(vault_path)
         self.approved_path = self.vault_path / 'Approved'
         self.done_path = self.vault_path / 'Done'
@@ -55,22 +55,26 @@ class ActionEngine:
         self.dashboard_path = self.vault_path / 'Dashboard.md'
         self.logs_path = self.vault_path / 'Logs'  # New Logs Folder
         self.check_interval = check_interval
+        self.flow = flow
         
         # Setup Logging
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger('ActionEngine')
 
-        # Load .env
+        # Load .env (multi-vault mode passes the vault's values in `settings` instead)
         env_path = self.vault_path / '.env'
-        if env_path.exists():
+        if settings is None and env_path.exists():
             load_dotenv(dotenv_path=env_path)
+        settings = settings or {}
         
         # Initialize SendGrid
-        self.sendgrid_api_key = os.getenv("SENDGRID_API_KEY")
-        self.from_email = os.getenv("FROM_EMAIL")
+        self.sendgrid_api_key = settings.get("SENDGRID_API_KEY") or os.getenv("SENDGRID_API_KEY")
+        self.from_email = settings.get("FROM_EMAIL") or os.getenv("FROM_EMAIL")
         self.sg = None
         
-        if SENDGRID_AVAILABLE and self.sendgrid_api_key and self.sendgrid_api_key.startswith("SG."):
+        if sendgrid_client is not None:
+            self.sg = sendgrid_client  # shared client (multi-vault mode)
+        elif SENDGRID_AVAILABLE and self.sendgrid_api_key and self.sendgrid_api_key.startswith("SG."):
             self.sg = SendGridAPIClient(self.sendgrid_api_key)
             self.logger.info("✅ SendGrid client initialized.")
 
@@ -130,31 +134,61 @@ class ActionEngine:
         except Exception as e:
             self.logger.error(f"Failed to write JSON log: {e}")
 
+    def pending_plans(self):
+        """Approved plans to execute this cycle, oldest first."""
+        if self.flow and not self.flow.action_open():
+            return []
+
+        dated = []
+        for plan_path in self.approved_path.glob("PLAN_*.md"):
+            try:
+                dated.append((plan_path.stat().st_mtime, plan_path))
+            except FileNotFoundError:
+                continue  # moved or deleted since the glob
+        files = [plan_path for _, plan_path in sorted(dated)]
+        if self.flow:
+            # Cap executions per cycle so email/API spend stays bounded during floods
+            files = files[:self.flow.action_batch()]
+        return files
+
     def process_files(self):
         """Scans Approved folder and executes actions."""
-        files = list(self.approved_path.glob("PLAN_*.md"))
+        for plan_path in self.pending_plans():
+            self.process_plan(plan_path)
+
+    def process_plan(self, plan_path):
+        """Executes a single approved plan."""
+        filename = plan_path.name
+        task_name = filename.replace("PLAN_", "").replace(".md", "")
+        self.logger.info(f"⚡️ Executing approved plan: {task_name}")
         
-        for plan_path in files:
-            filename = plan_path.name
-            task_name = filename.replace("PLAN_", "").replace(".md", "")
-            self.logger.info(f"⚡️ Executing approved plan: {task_name}")
-            
-            final_status = "Skipped"
-            
-            try:
-                plan_content = plan_path.read_text(encoding="utf-8").strip()
-                content_lower = plan_content.lower()
-
-                # --- 1. CEO BRIEFING / REPORT GENERATION ---
-                if "briefing" in content_lower or "report" in content_lower or "audit" in content_lower:
-                    cprint(f"Generating [bold magenta]CEO Briefing[/bold magenta]...", style="yellow")
-                    
-                    timestamp = datetime.now().strftime('%Y-%m-%d')
-                    briefing_filename = f"Monday_Briefing_{timestamp}.md"
-                    briefing_path = self.vault_path / briefing_filename
-                    
-                    # Gold Tier Mock Data
-                    briefing_content = f"""# 📊 Monday Morning CEO Briefing
+        final_status = "Skipped"
+        
+        try:
+            plan_content = plan_path.read_text(encoding="utf-8").strip()
+            content_lower = plan_content.lower()
+            front_matter = plan_content.split("---", 2)[1] if plan_content.startswith("---") else ""
+            triage_class = re.search(r'^triage_class:\s*(\S+)', front_matter, re.MULTILINE)
+
+            # --- 0. LOCAL TRIAGE ARCHIVE ---
+            # Templated plans quote filenames and CSV headers, so keyword matching must not pick their action
+            if re.search(r'^triage:\s*local\s*$', front_matter, re.MULTILINE):
+                final_status = "✅ Archived (Local Triage)"
+                self.update_dashboard(f"Archive: {task_name}", final_status)
+                self.log_action_json("archive", "file_system", "success",
+                                     {"reason": "local_triage", "class": triage_class.group(1) if triage_class else "unknown"})
+                shutil.move(str(plan_path), str(self.done_path / filename))
+
+            # --- 1. CEO BRIEFING / REPORT GENERATION ---
+            elif "briefing" in content_lower or "report" in content_lower or "audit" in content_lower:
+                cprint(f"Generating [bold magenta]CEO Briefing[/bold magenta]...", style="yellow")
+                
+                timestamp = datetime.now().strftime('%Y-%m-%d')
+                briefing_filename = f"Monday_Briefing_{timestamp}.md"
+                briefing_path = self.vault_path / briefing_filename
+                
+                # Gold Tier Mock Data
+                briefing_content = f"""# 📊 Monday Morning CEO Briefing
 **Date:** {timestamp}
 **Generated By:** AI Employee (Gold Tier)
 
@@ -175,79 +209,79 @@ class ActionEngine:
 
 *End of Report*
 """
-                    briefing_path.write_text(briefing_content, encoding="utf-8")
-                    
-                    final_status = "✅ Briefing Generated"
-                    cprint(f"📊 Report saved to: {briefing_filename}", style="green")
-                    
-                    self.update_dashboard(f"Report: {task_name}", final_status)
-                    self.log_action_json("report_generation", "CEO", "success", {"file": briefing_filename})
-                    shutil.move(str(plan_path), str(self.done_path / filename))
-
-                # --- 2. SOCIAL MEDIA ACTION ---
-                elif "post to twitter" in content_lower or "post to linkedin" in content_lower:
-                    platform = "Twitter" if "post to twitter" in content_lower else "LinkedIn"
-                    cprint(f"Executing [bold blue]Social Media Post[/bold blue] to {platform}...", style="yellow")
-                    
-                    if self.social_media_mcp:
-                        self.social_media_mcp.post_to_platform(platform, plan_content)
-                        final_status = "✅ Posted (MCP)"
-                    else:
-                        final_status = "✅ Posted (Mock)"
-
-                    self.update_dashboard(f"Social: {task_name}", final_status)
-                    self.log_action_json("social_post", platform, "success", {"content_snippet": plan_content[:30]})
-                    shutil.move(str(plan_path), str(self.done_path / filename))
-
-                # --- 3. EMAIL ACTION ---
-                elif "email" in content_lower or "send" in content_lower:
-                    if not self.sg:
-                        final_status = "❌ Failed (No API Key)"
-                        self.update_dashboard(f"Email: {task_name}", final_status)
-                        shutil.move(str(plan_path), str(self.rejected_path / filename))
-                        continue
-
-                    # Robust Regex Extraction
-                    to_email_match = re.search(r'(?:To|Recipient)[:\s\*-]*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', plan_content, re.IGNORECASE)
-                    if not to_email_match:
-                         to_email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', plan_content)
-
-                    to_email = to_email_match.group(1).strip() if to_email_match else None
-                    
-                    if to_email:
-                        cprint(f"Executing [bold green]SendGrid Email[/bold green] to {to_email}...", style="yellow")
-                        try:
-                            message = Mail(
-                                from_email=self.from_email,
-                                to_emails=to_email,
-                                subject="Update from AI Employee",
-                                html_content=plan_content.replace("\n", "<br>")
-                            )
-                            self.sg.send(message)
-                            final_status = "✅ Email Sent"
-                            self.log_action_json("email_send", to_email, "success", {"subject": "Update from AI Employee"})
-                            shutil.move(str(plan_path), str(self.done_path / filename))
-                        except Exception as e:
-                            final_status = f"❌ API Error: {e}"
-                            self.log_action_json("email_send", to_email, "failed", {"error": str(e)})
-                            shutil.move(str(plan_path), str(self.rejected_path / filename))
-                    else:
-                        final_status = "⚠️ Failed (No Email Found)"
-                        self.log_action_json("email_send", "unknown", "failed", {"error": "No recipient found"})
-                        shutil.move(str(plan_path), str(self.rejected_path / filename))
-                    
+                briefing_path.write_text(briefing_content, encoding="utf-8")
+                
+                final_status = "✅ Briefing Generated"
+                cprint(f"📊 Report saved to: {briefing_filename}", style="green")
+                
+                self.update_dashboard(f"Report: {task_name}", final_status)
+                self.log_action_json("report_generation", "CEO", "success", {"file": briefing_filename})
+                shutil.move(str(plan_path), str(self.done_path / filename))
+
+            # --- 2. SOCIAL MEDIA ACTION ---
+            elif "post to twitter" in content_lower or "post to linkedin" in content_lower:
+                platform = "Twitter" if "post to twitter" in content_lower else "LinkedIn"
+                cprint(f"Executing [bold blue]Social Media Post[/bold blue] to {platform}...", style="yellow")
+                
+                if self.social_media_mcp:
+                    self.social_media_mcp.post_to_platform(platform, plan_content)
+                    final_status = "✅ Posted (MCP)"
+                else:
+                    final_status = "✅ Posted (Mock)"
+
+                self.update_dashboard(f"Social: {task_name}", final_status)
+                self.log_action_json("social_post", platform, "success", {"content_snippet": plan_content[:30]})
+                shutil.move(str(plan_path), str(self.done_path / filename))
+
+            # --- 3. EMAIL ACTION ---
+            elif "email" in content_lower or "send" in content_lower:
+                if not self.sg:
+                    final_status = "❌ Failed (No API Key)"
                     self.update_dashboard(f"Email: {task_name}", final_status)
+                    shutil.move(str(plan_path), str(self.rejected_path / filename))
+                    return
+
+                # Robust Regex Extraction
+                to_email_match = re.search(r'(?:To|Recipient)[:\s\*-]*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', plan_content, re.IGNORECASE)
+                if not to_email_match:
+                     to_email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', plan_content)
 
-                # --- 4. GENERIC ARCHIVE ---
+                to_email = to_email_match.group(1).strip() if to_email_match else None
+                
+                if to_email:
+                    cprint(f"Executing [bold green]SendGrid Email[/bold green] to {to_email}...", style="yellow")
+                    try:
+                        message = Mail(
+                            from_email=self.from_email,
+                            to_emails=to_email,
+                            subject="Update from AI Employee",
+                            html_content=plan_content.replace("\n", "<br>")
+                        )
+                        self.sg.send(message)
+                        final_status = "✅ Email Sent"
+                        self.log_action_json("email_send", to_email, "success", {"subject": "Update from AI Employee"})
+                        shutil.move(str(plan_path), str(self.done_path / filename))
+                    except Exception as e:
+                        final_status = f"❌ API Error: {e}"
+                        self.log_action_json("email_send", to_email, "failed", {"error": str(e)})
+                        shutil.move(str(plan_path), str(self.rejected_path / filename))
                 else:
-                    self.logger.info(f"No specific action detected for {filename}. Moving to Done.")
-                    self.log_action_json("archive", "file_system", "success", {"reason": "no_action_needed"})
-                    shutil.move(str(plan_path), str(self.done_path / filename))
-
-            except Exception as e:
-                self.logger.error(f"Critical Error processing {filename}: {e}")
-                self.log_action_json("system_error", filename, "critical_failure", {"error": str(e)})
-                shutil.move(str(plan_path), str(self.rejected_path / filename))
+                    final_status = "⚠️ Failed (No Email Found)"
+                    self.log_action_json("email_send", "unknown", "failed", {"error": "No recipient found"})
+                    shutil.move(str(plan_path), str(self.rejected_path / filename))
+                
+                self.update_dashboard(f"Email: {task_name}", final_status)
+
+            # --- 4. GENERIC ARCHIVE ---
+            else:
+                self.logger.info(f"No specific action detected for {filename}. Moving to Done.")
+                self.log_action_json("archive", "file_system", "success", {"reason": "no_action_needed"})
+                shutil.move(str(plan_path), str(self.done_path / filename))
+
+        except Exception as e:
+            self.logger.error(f"Critical Error processing {filename}: {e}")
+            self.log_action_json("system_error", filename, "critical_failure", {"error": str(e)})
+            shutil.move(str(plan_path), str(self.rejected_path / filename))
 
     def run(self):
         self.logger.info("⚡️ Action Engine Activated (SSL Bypass + Briefing + JSON Logs). Watching /Approved...")
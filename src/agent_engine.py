@@ -1,11 +1,16 @@
 import os
+import json
 import time
 import shutil
 import logging
+import threading
+import concurrent.futures
 import warnings
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
+from triage_engine import TriageEngine, TriageStats
+from business_goals import BusinessGoalsStore, compute_briefing_metrics, render_metrics_markdown
 
 # Suppress Warnings
 warnings.filterwarnings("ignore")
@@ -13,12 +18,15 @@ warnings.filterwarnings("ignore")
 # Try importing AI library
 try:
     import google.generativeai as genai
+    import google.ai.generativelanguage as glm
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
 
+BRIEFING_TRIGGER = "GENERATE_BRIEFING"
+
 class AgentEngine:
-    def __init__(self, vault_path, check_interval=5):
+    def __init__(self, vault_path, check_interval=5, flow=None, model=None, model_name=None, triage=None, settings=None):
         self.vault_path = Path(vault_path)
         self.needs_action = self.vault_path / 'Needs_Action'
         self.plans_path = self.vault_path / 'Plans'
@@ -27,31 +35,45 @@ class AgentEngine:
         self.dashboard_path = self.vault_path / 'Dashboard.md'
         self.goals_path = self.vault_path / 'Business_Goals.md'
         self.check_interval = check_interval
+        self.flow = flow
+        self._dashboard_lock = threading.Lock()
         
         # Setup Logging
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger('AgentEngine')
 
-        # Load Env
+        # Load Env (multi-vault mode passes the vault's values in `settings` instead)
         env_path = self.vault_path / '.env'
-        load_dotenv(dotenv_path=env_path)
+        if settings is None:
+            load_dotenv(dotenv_path=env_path)
+        settings = settings or {}
         
         # Configure AI
-        self.api_key = os.getenv("GEMINI_API_KEY")
+        self.api_key = settings.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
+        try:
+            self.triage_confidence = float(settings["TRIAGE_CONFIDENCE"]) if settings.get("TRIAGE_CONFIDENCE") else None
+        except ValueError:
+            self.triage_confidence = None
         self.model = None
         self.model_name = "AI Unavailable" # Default to AI Unavailable
 
-        if not self.api_key or self.api_key == "PASTE_YOUR_KEY_HERE":
+        if model is not None or model_name:
+            # Model (or its failed setup) shared from another engine with the same key: skip discovery
+            self.model = model
+            self.model_name = model_name or "Gemini (Shared)"
+        elif not self.api_key or self.api_key == "PASTE_YOUR_KEY_HERE":
             self.logger.warning("GEMINI_API_KEY not found or not set. AI capabilities disabled.")
         elif AI_AVAILABLE:
             try:
-                genai.configure(api_key=self.api_key)
+                # Clients are bound to this engine's key. genai.configure() is process-global, so
+                # another vault's engine could otherwise swap the key under this model.
+                client_options = {"api_key": self.api_key}
                 
                 # --- Robust Model Selection ---
                 selected_model_name = None
                 try:
                     self.logger.info("🔍 Searching for available Gemini models...")
-                    for m in genai.list_models():
+                    for m in genai.list_models(client=glm.ModelServiceClient(client_options=client_options)):
                         if 'generateContent' in m.supported_generation_methods:
                             # Prefer models that don't require specific versioning if possible, or a flexible one
                             # This prioritizes 'gemini-1.5-flash' but is flexible
@@ -69,6 +91,7 @@ class AgentEngine:
 
                 if selected_model_name:
                     self.model = genai.GenerativeModel(selected_model_name)
+                    self.model._client = glm.GenerativeServiceClient(client_options=client_options)
                     self.model_name = selected_model_name.replace('models/', '') # Clean up name for dashboard
                     self.logger.info(f"✨ AI Connected successfully using: {self.model_name}")
                 else:
@@ -81,6 +104,11 @@ class AgentEngine:
                 self.model = None
                 self.model_name = "AI Unavailable (Config Error)"
         
+        # Local fast-path for trivial tasks
+        self.triage = triage or TriageEngine()
+        self.triage_stats = TriageStats()  # this vault's routing counts, even when the engine is shared
+        self.goals = BusinessGoalsStore(self.goals_path)
+
         # Ensure folders exist
         self.in_progress.mkdir(exist_ok=True)
         self.plans_path.mkdir(exist_ok=True)
@@ -132,6 +160,10 @@ Process file: **{filename}** (Manual Mode)
         return f"---\nstatus: Pending Approval\ndate: {date_str}\ntarget_file: {filename}\n---\n\n{ai_response}"
 
     def update_dashboard(self, task_name, status, model_name):
+        with self._dashboard_lock:
+            self._write_dashboard(task_name, status, model_name)
+
+    def _write_dashboard(self, task_name, status, model_name):
         now = datetime.now().strftime("%Y-%m-%d %H:%M")
         new_row = f"| {now} | {task_name} | {status} | {model_name} |"
         
@@ -169,56 +201,122 @@ Process file: **{filename}** (Manual Mode)
     def generate_briefing(self):
         """Generates a Monday Morning CEO Briefing."""
         self.logger.info("Generating CEO Briefing...")
-        
-        completed_tasks = [f for f in os.listdir(self.done_path) if os.path.isfile(self.done_path / f)]
-        completed_tasks_list = "\n".join(f"- {task}" for task in completed_tasks[-20:])
 
         if not self.goals_path.exists():
             self.goals_path.write_text("# Weekly Business Goals\n\n## Revenue Targets\n| Week | Target | Actual |\n|---|---|---|\n| 2026-W6 | $3,000 | $0 |", encoding="utf-8")
         
-        business_goals = self.goals_path.read_text(encoding="utf-8")
+        # Figures are computed locally; the model only writes the narrative around them
+        metrics = compute_briefing_metrics(self.goals.get(), self.done_path, self.vault_path / 'Logs')
+        key_figures = render_metrics_markdown(metrics)
+        summary = json.dumps(metrics, separators=(',', ':'), default=str)
 
-        prompt = f"You are a proactive Business AI Assistant. Review the data and write a 'Monday Morning CEO Briefing' in Markdown.\n\n**Data:**\n1. **Recently Completed Tasks:**\n{completed_tasks_list}\n\n2. **Current Business Goals:**\n{business_goals}\n\n**Instructions:**\n- Write a concise **Executive Summary**.\n- Analyze **Revenue vs Target**. Invent plausible revenue numbers based on tasks.\n- Identify potential **Bottlenecks**.\n- Provide **Proactive Suggestions**."
+        prompt = f"You are a proactive Business AI Assistant. Write a 'Monday Morning CEO Briefing' in Markdown from these computed figures (JSON):\n{summary}\n\n**Instructions:**\n- Write a concise **Executive Summary**.\n- Comment on **Revenue vs Target** using only the figures given. Do not invent numbers.\n- Identify potential **Bottlenecks**.\n- Provide **Proactive Suggestions**.\n- Do not repeat the figures as a table; it is already included."
         
-        briefing_content = self.ask_gemini(prompt) or "# Briefing Failed\nAI model unavailable."
+        narrative = self.ask_gemini(prompt) or "# Briefing Failed\nAI model unavailable."
+        briefing_content = f"{narrative}\n\n{key_figures}\n"
         
         briefing_filename = f"Briefing_{datetime.now().strftime('%Y-%m-%d')}.md"
         briefing_path = self.vault_path / briefing_filename
         briefing_path.write_text(briefing_content, encoding="utf-8")
         self.logger.info(f"Successfully generated briefing: {briefing_filename}")
         self.update_dashboard(task_name="Generated CEO Briefing", status="📄 Report Ready", model_name=self.model_name)
+        return briefing_filename
+
+    def flush_caches(self):
+        self.goals.flush()
+        self.logger.info("🧹 Business goals cache flushed.")
+
+    def claim_task(self, file):
+        """Moves a task into In_Progress and triages it. Returns None if the move failed."""
+        self.logger.info(f"🧠 Thinking about: {file}...")
+        
+        try:
+            shutil.move(self.needs_action / file, self.in_progress / file)
+        except Exception as e:
+            self.logger.error(f"Move failed: {e}")
+            return None
+
+        return self.triage.classify(self.in_progress / file, confidence_threshold=self.triage_confidence,
+                                    stats=self.triage_stats)
+
+    def write_plan(self, file, decision):
+        if decision.local:
+            plan_content = self.triage.render_plan(self.in_progress / file, decision)
+            model_name = f"Local Triage ({decision.confidence:.2f})"
+        else:
+            plan_content = self.generate_plan_content(file)
+            model_name = self.model_name
+
+        plan_path = self.plans_path / f"PLAN_{file}.md"
+        plan_path.write_text(plan_content, encoding="utf-8")
+        
+        self.logger.info(f"💡 Plan created: {plan_path.name}")
+        self.update_dashboard(f"Processed {file}", status="✅ Plan Ready", model_name=model_name)
+
+    def process_file(self, file):
+        decision = self.claim_task(file)
+        if decision is not None:
+            self.write_plan(file, decision)
+
+    def pending_tasks(self):
+        """Lists task files waiting in Needs_Action."""
+        files = [f for f in os.listdir(self.needs_action) if os.path.isfile(self.needs_action / f)]
+        return [f for f in files if f != BRIEFING_TRIGGER and not f.endswith(".md")]
+
+    def briefing_requested(self):
+        return (self.needs_action / BRIEFING_TRIGGER).exists()
+
+    def run_briefing_trigger(self):
+        try:
+            self.generate_briefing()
+            os.remove(self.needs_action / BRIEFING_TRIGGER)
+            self.logger.info("Briefing generated and trigger file removed.")
+        except Exception as e:
+            self.logger.error(f"Failed to generate briefing: {e}", exc_info=True)
 
     def process_files(self):
         try:
-            files = [f for f in os.listdir(self.needs_action) if os.path.isfile(self.needs_action / f)]
-            
-            for file in files:
-                if file == "GENERATE_BRIEFING":
-                    try:
-                        self.generate_briefing()
-                        os.remove(self.needs_action / file)
-                        self.logger.info("Briefing generated and trigger file removed.")
-                    except Exception as e:
-                        self.logger.error(f"Failed to generate briefing: {e}", exc_info=True)
-                    continue
+            if self.briefing_requested() and (not self.flow or self.flow.agent_open()):
+                self.run_briefing_trigger()
 
-                if file.endswith(".md"): 
-                    continue 
+            tasks = self.pending_tasks()
+            if not tasks:
+                return
 
-                self.logger.info(f"🧠 Thinking about: {file}...")
-                
-                try:
-                    shutil.move(self.needs_action / file, self.in_progress / file)
-                except Exception as e:
-                    self.logger.error(f"Move failed: {e}")
+            if not self.flow:
+                for file in tasks:
+                    self.process_file(file)
+                return
+
+            # Backpressure: stop drafting while Plans/ is over its high watermark or the stage is paused
+            if not self.flow.agent_open():
+                self.logger.info(f"⏸️ Agent held, keeping {len(tasks)} task(s) in Needs_Action.")
+                return
+
+            # Local triage plans are written inline; only Gemini-bound tasks share the limited workers.
+            # Claim at most two Gemini tasks per worker so pause, gate changes and a pending briefing
+            # are picked up between batches instead of after the whole backlog.
+            remote = []
+            remote_limit = self.flow.llm_concurrency() * 2
+            for file in tasks[:self.flow.plan_capacity()]:
+                if len(remote) >= remote_limit or not self.flow.agent_open():
+                    break
+                decision = self.claim_task(file)
+                if decision is None:
                     continue
+                if decision.local:
+                    self.write_plan(file, decision)
+                else:
+                    remote.append((file, decision))
+            if not remote:
+                return
 
-                plan_content = self.generate_plan_content(file)
-                plan_path = self.plans_path / f"PLAN_{file}.md"
-                plan_path.write_text(plan_content, encoding="utf-8")
-                
-                self.logger.info(f"💡 Plan created: {plan_path.name}")
-                self.update_dashboard(f"Processed {file}", status="✅ Plan Ready", model_name=self.model_name)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.flow.llm_concurrency()) as executor:
+                for future in [executor.submit(self.write_plan, f, d) for f, d in remote]:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error processing task: {e}", exc_info=True)
 
         except Exception as e:
             self.logger.error(f"Error in process loop: {e}", exc_info=True)
@@ -0,0 +1,180 @@
+import re
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+
+@dataclass
+class RevenueTarget:
+    week: str
+    target: Optional[float]
+    actual: Optional[float]
+
+
+@dataclass
+class Project:
+    name: str
+    done: bool
+    note: str = ""
+
+
+@dataclass
+class BusinessGoals:
+    revenue_targets: list = field(default_factory=list)
+    projects: list = field(default_factory=list)
+
+
+def _money(cell):
+    """Parses a currency cell; placeholders such as 'TBD' give None rather than a fake $0."""
+    digits = re.sub(r'[^\d.\-]', '', cell)
+    try:
+        return float(digits) if digits else None
+    except ValueError:
+        return None
+
+
+def _format_money(value):
+    if value is None:
+        return "n/a"
+    return f"-${-value:,.0f}" if value < 0 else f"${value:,.0f}"
+
+
+def _table_rows(lines):
+    """Yields the cells of each body row of the first Markdown table in `lines`."""
+    rows = [line.strip() for line in lines if line.strip().startswith('|')]
+    for row in rows[1:]:
+        cells = [c.strip() for c in row.strip('|').split('|')]
+        if all(re.fullmatch(r':?-+:?', c) for c in cells if c):
+            continue
+        yield cells
+
+
+def parse_business_goals(text):
+    """Parses the Business_Goals.md tables and checklists into a BusinessGoals model."""
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        heading = re.match(r'^##\s+(.*)', line)
+        if heading:
+            current = heading.group(1).strip().lower()
+            sections[current] = []
+        elif current:
+            sections[current].append(line)
+
+    goals = BusinessGoals()
+    for cells in _table_rows(sections.get('revenue targets', [])):
+        if len(cells) >= 3 and cells[0]:
+            goals.revenue_targets.append(RevenueTarget(cells[0], _money(cells[1]), _money(cells[2])))
+
+    for line in sections.get('active projects', []):
+        item = re.match(r'^\s*[-*]\s*\[([ xX])\]\s*(.+)', line)
+        if item:
+            name, _, note = item.group(2).partition(' - ')
+            goals.projects.append(Project(name.strip(), item.group(1).lower() == 'x', note.strip()))
+    return goals
+
+
+class BusinessGoalsStore:
+    """Caches the parsed Business_Goals.md, re-parsing only when the file's mtime changes."""
+
+    def __init__(self, goals_path):
+        self.goals_path = Path(goals_path)
+        self.logger = logging.getLogger('BusinessGoals')
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._goals = None
+
+    def get(self):
+        mtime = self.goals_path.stat().st_mtime_ns
+        with self._lock:
+            if self._goals is None or mtime != self._mtime:
+                self._goals = parse_business_goals(self.goals_path.read_text(encoding="utf-8"))
+                self._mtime = mtime
+                self.logger.info(f"🎯 Business goals loaded: {len(self._goals.revenue_targets)} revenue rows, {len(self._goals.projects)} projects.")
+            return self._goals
+
+    def flush(self):
+        with self._lock:
+            self._goals = None
+            self._mtime = None
+
+
+def iso_week(ts):
+    year, week, _ = ts.isocalendar()
+    return f"{year}-W{week}"
+
+
+def _done_count(done_path):
+    return sum(1 for p in Path(done_path).iterdir() if p.is_file())
+
+
+def _audit_log(logs_path):
+    entries = []
+    for log_file in sorted(Path(logs_path).glob("*.json")):
+        try:
+            data = json.loads(log_file.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            continue
+        if isinstance(data, list):
+            entries.extend(e for e in data if isinstance(e, dict))
+    df = pd.DataFrame(entries, columns=["timestamp", "action_type", "result"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    return df.dropna(subset=["timestamp"])
+
+
+def compute_briefing_metrics(goals, done_path, logs_path, now=None):
+    """Computes revenue-vs-target and task-volume figures from vault data.
+
+    Weekly completion counts come from successful audit log entries; Done/ only
+    supplies the all-time total.
+    """
+    now = now or datetime.now()
+    this_week, last_week = iso_week(now), iso_week(now - pd.Timedelta(days=7))
+
+    revenue = pd.DataFrame([vars(r) for r in goals.revenue_targets], columns=["week", "target", "actual"])
+    revenue = revenue.astype({"target": float, "actual": float})
+    revenue["gap"] = revenue["actual"] - revenue["target"]
+    revenue["attainment_pct"] = (revenue["actual"] / revenue["target"].where(revenue["target"] > 0) * 100).round(1)
+
+    done_total = _done_count(done_path) if Path(done_path).exists() else 0
+
+    # Completion time comes from the audit trail; Done/ mtimes only reflect when a plan was written
+    audit = _audit_log(logs_path) if Path(logs_path).exists() else pd.DataFrame(columns=["timestamp", "action_type", "result"])
+    audit_weeks = audit["timestamp"].map(iso_week) if not audit.empty else pd.Series(dtype=str)
+    completed_weeks = audit_weeks[audit["result"] == "success"] if not audit.empty else audit_weeks
+    audit_week = audit[audit_weeks == this_week] if not audit.empty else audit
+
+    return {
+        "week": this_week,
+        "revenue": revenue.astype(object).where(revenue.notna(), None).to_dict(orient="records"),
+        "revenue_total": {"target": float(revenue["target"].sum()), "actual": float(revenue["actual"].sum())},
+        "tasks_done": {"total": done_total, "this_week": int((completed_weeks == this_week).sum()),
+                       "last_week": int((completed_weeks == last_week).sum())},
+        "actions_this_week": {k: int(v) for k, v in audit_week.groupby("action_type").size().items()},
+        "failed_actions_this_week": int((audit_week["result"] != "success").sum()),
+        "projects": {"open": sum(not p.done for p in goals.projects), "done": sum(p.done for p in goals.projects),
+                     "open_names": [p.name for p in goals.projects if not p.done]},
+    }
+
+
+def render_metrics_markdown(metrics):
+    """Renders the computed figures as the 'Key Figures' section of a briefing."""
+    lines = ["## 📈 Key Figures", "| Week | Target | Actual | Gap | Attainment |", "|---|---|---|---|---|"]
+    for r in metrics["revenue"]:
+        pct = "n/a" if r["attainment_pct"] is None else f"{r['attainment_pct']}%"
+        money = [_format_money(r[k]) for k in ("target", "actual", "gap")]
+        lines.append(f"| {r['week']} | {' | '.join(money)} | {pct} |")
+    tasks = metrics["tasks_done"]
+    lines += [
+        "",
+        f"- **Tasks completed ({metrics['week']}):** {tasks['this_week']} (last week: {tasks['last_week']}, all time: {tasks['total']})",
+        f"- **Actions executed this week:** {sum(metrics['actions_this_week'].values())} ({metrics['failed_actions_this_week']} failed)",
+        f"- **Projects:** {metrics['projects']['open']} open, {metrics['projects']['done']} done",
+    ]
+    return "\n".join(lines)
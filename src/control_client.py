@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import socket
+import argparse
+from pathlib import Path
+
+# Add the src directory to the Python path to allow sibling imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from control_server import default_socket_path
+
+
+class ControlUnavailable(Exception):
+    """Raised when no orchestrator is listening on the control socket."""
+
+
+class ControlError(Exception):
+    """Raised when the orchestrator rejects or fails a command."""
+
+
+def send_command(command, args=None, vault_path=None, socket_path=None, timeout=300):
+    """Sends one command to the running orchestrator and returns its result."""
+    if vault_path is None:
+        vault_path = Path(__file__).resolve().parent.parent
+    path = Path(socket_path) if socket_path else default_socket_path(vault_path)
+
+    if not hasattr(socket, 'AF_UNIX') or not path.exists():
+        raise ControlUnavailable(f"No control socket at {path}. Is the orchestrator running?")
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall((json.dumps({"command": command, "args": args or {}}) + "\n").encode('utf-8'))
+            with sock.makefile('r', encoding='utf-8') as stream:
+                line = stream.readline()
+    except socket.timeout:
+        # The command may still be running on the orchestrator, so this is not a reason to fall back
+        raise ControlError(f"Orchestrator at {path} did not answer within {timeout}s.")
+    except (ConnectionRefusedError, FileNotFoundError, PermissionError) as e:
+        raise ControlUnavailable(f"Orchestrator not reachable at {path}: {e}")
+    except OSError as e:
+        raise ControlError(f"Connection to orchestrator at {path} failed: {e}")
+
+    if not line:
+        raise ControlError("Orchestrator closed the connection without a response.")
+    try:
+        response = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ControlError(f"Malformed response from orchestrator: {e}")
+    if not response.get("ok"):
+        raise ControlError(response.get("error", "Unknown error"))
+    return response.get("result")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control the running Personal AI Employee orchestrator.")
+    parser.add_argument("--socket", help="Path to the control socket (default: <vault>/.control.sock)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("briefing", help="Generate a CEO briefing now")
+    for name in ("pause", "resume"):
+        stage_parser = sub.add_parser(name, help=f"{name.capitalize()} a pipeline stage")
+        stage_parser.add_argument("stage", choices=["intake", "agent", "action"])
+    sub.add_parser("status", help="Show queue depths, gates and paused stages")
+    sub.add_parser("flush_caches", help="Drop in-memory caches")
+    sub.add_parser("metrics", help="Dump runtime metrics")
+    opts = parser.parse_args()
+
+    args = {"stage": opts.stage} if opts.command in ("pause", "resume") else {}
+    try:
+        result = send_command(opts.command, args, socket_path=opts.socket)
+    except (ControlUnavailable, ControlError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import socket
+import logging
+import threading
+import socketserver
+from pathlib import Path
+
+# Unix-domain sockets are not available on every platform (e.g. older Windows builds)
+CONTROL_AVAILABLE = hasattr(socketserver, 'ThreadingUnixStreamServer')
+
+DEFAULT_SOCKET_NAME = '.control.sock'
+
+
+def default_socket_path(vault_path):
+    return Path(vault_path) / DEFAULT_SOCKET_NAME
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request per line and writes one JSON response per line."""
+
+    def handle(self):
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            try:
+                request = json.loads(raw)
+                result = self.server.control.dispatch(request.get("command"), request.get("args") or {})
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response, default=str) + "\n").encode('utf-8'))
+            self.wfile.flush()
+
+
+class ControlServer:
+    """Local control plane so CLI tools can drive the running orchestrator."""
+
+    def __init__(self, vault_path, agent_engine, flow, socket_path=None, components=()):
+        self.vault_path = Path(vault_path)
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path(vault_path)
+        self.agent_engine = agent_engine
+        self.flow = flow
+        self.components = [agent_engine, *components]
+        self.logger = logging.getLogger('ControlServer')
+        self.started_at = time.time()
+        self.commands_served = {}
+        self._stats_lock = threading.Lock()
+        self._server = None
+        self.handlers = {
+            "briefing": self.cmd_briefing,
+            "pause": self.cmd_pause,
+            "resume": self.cmd_resume,
+            "status": self.cmd_status,
+            "flush_caches": self.cmd_flush_caches,
+            "metrics": self.cmd_metrics,
+        }
+
+    def dispatch(self, command, args):
+        handler = self.handlers.get(command)
+        if handler is None:
+            raise ValueError(f"Unknown command '{command}'. Available: {', '.join(sorted(self.handlers))}")
+        with self._stats_lock:
+            self.commands_served[command] = self.commands_served.get(command, 0) + 1
+        return handler(**args)
+
+    def _served(self):
+        with self._stats_lock:
+            return dict(self.commands_served)
+
+    def cmd_briefing(self):
+        return {"file": self.agent_engine.generate_briefing()}
+
+    def cmd_pause(self, stage):
+        self.flow.pause(stage)
+        return {"paused": sorted(self.flow.paused)}
+
+    def cmd_resume(self, stage):
+        self.flow.resume(stage)
+        return {"paused": sorted(self.flow.paused)}
+
+    def cmd_status(self):
+        self.flow.refresh()
+        return self.flow.snapshot()
+
+    def cmd_flush_caches(self):
+        flushed = []
+        for component in self.components:
+            flush = getattr(component, 'flush_caches', None)
+            if callable(flush):
+                flush()
+                flushed.append(component.__class__.__name__)
+        return {"flushed": flushed}
+
+    def cmd_metrics(self):
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "model": self.agent_engine.model_name,
+            "triage": self.agent_engine.triage_stats.snapshot(),
+            "flow": self.flow.snapshot(),
+            "commands_served": self._served(),
+        }
+
+    def _in_use(self):
+        """Whether a live server still accepts connections on the socket path."""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        probe.settimeout(1)
+        try:
+            probe.connect(str(self.socket_path))
+            return True
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False  # nobody listening: left behind by a crashed run
+        finally:
+            probe.close()
+
+    def start(self):
+        """Binds the socket and serves requests on a daemon thread."""
+        if not CONTROL_AVAILABLE:
+            self.logger.warning("Unix-domain sockets unavailable on this platform. Control API disabled.")
+            return False
+        # Owner-only from the moment the socket exists
+        old_umask = os.umask(0o177)
+        try:
+            if self.socket_path.exists():
+                if self._in_use():
+                    self.logger.error(f"❌ Another orchestrator is already serving {self.socket_path}. Control API disabled.")
+                    return False
+                self.socket_path.unlink()  # stale socket from a previous run
+            server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), _ControlHandler)
+        except OSError as e:
+            self.logger.error(f"❌ Could not bind control socket {self.socket_path}: {e}. Control API disabled.")
+            return False
+        finally:
+            os.umask(old_umask)
+        self._server = server
+        self._server.daemon_threads = True
+        self._server.control = self
+        threading.Thread(target=self._server.serve_forever, name='ControlServer', daemon=True).start()
+        self.logger.info(f"🎛️ Control API listening on: {self.socket_path}")
+        return True
+
+    def stop(self):
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if self.socket_path.exists():
+            self.socket_path.unlink()
@@ -1,14 +1,20 @@
 import time
 import logging
+import threading
 import shutil
 import os
 from watchdog.events import FileSystemEventHandler
 from pathlib import Path
 
 class DropFolderHandler(FileSystemEventHandler):
-    def __init__(self, vault_path):
+    def __init__(self, vault_path, flow=None):
         self.vault_path = Path(vault_path)
+        self.input_path = self.vault_path / 'Input_Dropzone'
         self.needs_action = self.vault_path / 'Needs_Action'
+        self.flow = flow
+        self.deferred = False
+        self._claimed = set()  # source paths being moved (observer vs. drain thread)
+        self._claim_lock = threading.Lock()
         self.logger = logging.getLogger('FilesystemWatcher')
         
         # Ensure destination exists
@@ -19,11 +25,53 @@ class DropFolderHandler(FileSystemEventHandler):
         if event.is_directory:
             return
         
+        # Backpressure: leave the file in the dropzone until Needs_Action drains
+        if self.flow and not self.flow.intake_open():
+            self.logger.info(f"⏸️ Intake paused, deferring {os.path.basename(event.src_path)}")
+            with self._claim_lock:
+                self.deferred = True
+            return
+
         # Slight delay to ensure file handle is released by OS
         time.sleep(0.5)
         self.process_file(event.src_path)
 
+    def drain_backlog(self):
+        """Moves files deferred by backpressure once intake is open again."""
+        # Clear the flag before scanning so a file deferred mid-drain triggers another pass
+        with self._claim_lock:
+            deferred, self.deferred = self.deferred, False
+        if not deferred or not self.input_path.exists():
+            return
+        dated = []
+        for entry in self.input_path.iterdir():
+            try:
+                if entry.is_file():
+                    dated.append((entry.stat().st_mtime, entry))
+            except FileNotFoundError:
+                continue
+        for _, entry in sorted(dated):
+            if self.flow and not self.flow.intake_open():
+                with self._claim_lock:
+                    self.deferred = True
+                return
+            self.process_file(str(entry))
+
     def process_file(self, src_path):
+        key = os.path.abspath(src_path)
+        with self._claim_lock:
+            if key in self._claimed:
+                return
+            self._claimed.add(key)
+        try:
+            # Another thread may already have moved it
+            if os.path.exists(src_path):
+                self._move_file(src_path)
+        finally:
+            with self._claim_lock:
+                self._claimed.discard(key)
+
+    def _move_file(self, src_path):
         filename = os.path.basename(src_path)
         dest_path = self.needs_action / filename
         
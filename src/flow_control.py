@@ -0,0 +1,184 @@
+import os
+import logging
+import threading
+from pathlib import Path
+from dotenv import load_dotenv
+
+
+class Watermark:
+    """A hysteresis gate: closes at or above `high`, re-opens once at or below `low`."""
+
+    def __init__(self, name, high, low):
+        if low > high:
+            raise ValueError(f"{name}: low watermark ({low}) must not exceed high watermark ({high})")
+        self.name = name
+        self.high = high
+        self.low = low
+        self.value = 0
+        self.is_open = True
+
+    def update(self, value):
+        """Feeds a new reading and returns True if the gate changed state."""
+        self.value = value
+        if self.is_open and value >= self.high:
+            self.is_open = False
+            return True
+        if not self.is_open and value <= self.low:
+            self.is_open = True
+            return True
+        return False
+
+
+STAGES = ('intake', 'agent', 'action')
+
+
+def env_number(name, default, cast=int, settings=None):
+    """Reads a numeric setting from `settings` (a vault's .env values) or the process env."""
+    value = settings.get(name) if settings and settings.get(name) is not None else os.getenv(name, default)
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return cast(default)
+
+
+class FlowController:
+    """Bounds the watcher -> agent -> action pipeline using folder depths and system load."""
+
+    def __init__(self, vault_path, settings=None):
+        self.vault_path = Path(vault_path)
+        self.input_path = self.vault_path / 'Input_Dropzone'
+        self.needs_action = self.vault_path / 'Needs_Action'
+        self.plans_path = self.vault_path / 'Plans'
+        self.approved_path = self.vault_path / 'Approved'
+        self.logger = logging.getLogger('FlowController')
+        self._lock = threading.Lock()
+
+        # Watermarks are configurable through the vault's .env. Multi-vault mode passes each
+        # vault's values in `settings` so one vault's file cannot leak into another's.
+        env_path = self.vault_path / '.env'
+        if settings is None and env_path.exists():
+            load_dotenv(dotenv_path=env_path)
+        number = lambda name, default, cast=int: env_number(name, default, cast, settings)
+
+        # A default low watermark never exceeds a configured high one
+        high = number("FLOW_NEEDS_ACTION_HIGH", 100)
+        self.needs_action_gate = Watermark('Needs_Action', high, number("FLOW_NEEDS_ACTION_LOW", min(50, high)))
+        high = number("FLOW_PLANS_HIGH", 200)
+        self.plans_gate = Watermark('Plans', high, number("FLOW_PLANS_LOW", min(150, high)))
+        high = number("FLOW_LOAD_HIGH", 90.0, float)
+        self.load_gate = Watermark('System Load', high, number("FLOW_LOAD_LOW", min(75.0, high), float))
+        self.max_llm_workers = max(1, number("FLOW_MAX_LLM_WORKERS", 2))
+        self.max_action_batch = max(1, number("FLOW_MAX_ACTION_BATCH", 10))
+        self.depths = {}
+        self.paused = set()
+        self.cpu = 0.0
+        self.ram = 0.0
+
+    def _count(self, path, skip_metadata=False):
+        try:
+            return sum(1 for f in os.listdir(path)
+                       if os.path.isfile(path / f) and not (skip_metadata and f.endswith('.md')))
+        except FileNotFoundError:
+            return 0
+
+    def _apply(self, gate, value):
+        if gate.update(value):
+            if gate.is_open:
+                self.logger.info(f"🟢 {gate.name} back under low watermark ({value} <= {gate.low}). Resuming.")
+            else:
+                self.logger.warning(f"🛑 {gate.name} over high watermark ({value} >= {gate.high}). Applying backpressure.")
+
+    def refresh(self):
+        """Re-reads queue depths and updates the gates."""
+        depths = {
+            'input_dropzone': self._count(self.input_path),
+            'needs_action': self._count(self.needs_action, skip_metadata=True),
+            'plans': self._count(self.plans_path),
+            'approved': self._count(self.approved_path),
+        }
+        with self._lock:
+            self.depths = depths
+            self._apply(self.needs_action_gate, depths['needs_action'])
+            self._apply(self.plans_gate, depths['plans'])
+        return depths
+
+    def report_load(self, cpu, ram):
+        """Called by SystemWatcher with the latest resource readings."""
+        with self._lock:
+            self.cpu, self.ram = cpu, ram
+            self._apply(self.load_gate, max(cpu, ram))
+
+    def pause(self, stage):
+        """Manually holds a stage until resume() is called."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}'. Expected one of: {', '.join(STAGES)}")
+        with self._lock:
+            self.paused.add(stage)
+        self.logger.info(f"⏸️ Stage '{stage}' paused.")
+
+    def resume(self, stage):
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}'. Expected one of: {', '.join(STAGES)}")
+        with self._lock:
+            self.paused.discard(stage)
+        self.logger.info(f"▶️ Stage '{stage}' resumed.")
+
+    def intake_open(self):
+        """Whether the filesystem watcher may move new files into Needs_Action."""
+        self.refresh()
+        with self._lock:
+            return ('intake' not in self.paused and self.needs_action_gate.is_open
+                    and self.plans_gate.is_open and self.load_gate.is_open)
+
+    def agent_open(self):
+        """Whether the agent may draft new plans."""
+        self.refresh()
+        with self._lock:
+            return 'agent' not in self.paused and self.plans_gate.is_open
+
+    def action_open(self):
+        """Whether the action engine may execute approved plans."""
+        with self._lock:
+            return 'action' not in self.paused
+
+    def _llm_concurrency(self):
+        if not self.load_gate.is_open or self.plans_gate.value > self.plans_gate.low:
+            return 1
+        return self.max_llm_workers
+
+    def llm_concurrency(self):
+        """Number of concurrent plan generations, reduced under pressure."""
+        with self._lock:
+            return self._llm_concurrency()
+
+    def plan_capacity(self):
+        """How many more plans can be written before Plans/ hits its high watermark."""
+        with self._lock:
+            return max(self.plans_gate.high - self.plans_gate.value, 0)
+
+    def action_batch(self):
+        """Maximum approved plans the action engine executes per cycle."""
+        with self._lock:
+            if not self.load_gate.is_open:
+                return 1
+            return self.max_action_batch
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'depths': dict(self.depths),
+                'gates': {g.name: 'open' if g.is_open else 'closed'
+                          for g in (self.needs_action_gate, self.plans_gate, self.load_gate)},
+                'paused': sorted(self.paused),
+                'cpu': self.cpu,
+                'ram': self.ram,
+                'llm_concurrency': self._llm_concurrency(),
+            }
+
+    def report(self):
+        """Logs current queue depths and gate states."""
+        self.refresh()
+        snap = self.snapshot()
+        depths = ", ".join(f"{k}={v}" for k, v in snap['depths'].items())
+        gates = ", ".join(f"{k}={v}" for k, v in snap['gates'].items())
+        self.logger.info(f"📦 Queue depths: {depths} | Gates: {gates} | LLM workers: {snap['llm_concurrency']}")
@@ -6,7 +6,7 @@ import logging
 # Add the src directory to the Python path to allow sibling imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from agent_engine import AgentEngine
+from control_client import send_command, ControlUnavailable, ControlError
 
 # Configure basic logging for visibility
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,19 +19,23 @@ def main():
     vault_root = Path(__file__).resolve().parent.parent
 
     try:
-        # Initialize the AgentEngine
-        # AgentEngine's __init__ expects needs_action_dir, plans_dir, in_progress_dir.
-        # We can pass the vault_root and let AgentEngine construct these paths internally.
-        # However, the AgentEngine __init__ currently expects needs_action_dir, plans_dir, in_progress_dir as separate arguments.
-        # Let's adjust the AgentEngine to take a single vault_path and derive its directories, or pass all required paths here.
-        # For now, let's pass the derived paths as it was designed.
+        # Ask the running orchestrator to reuse its already-initialized AgentEngine
+        result = send_command("briefing", vault_path=vault_root)
+        logger.info(f"✅ Briefing Generated! Check {result['file']}")
+        return
+    except ControlUnavailable as e:
+        logger.warning(f"{e} Falling back to a standalone AgentEngine.")
+    except ControlError as e:
+        logger.error(f"Orchestrator failed to generate briefing: {e}")
+        return
+
+    try:
+        from agent_engine import AgentEngine
 
         engine = AgentEngine(vault_path=vault_root)
+        briefing_file = engine.generate_briefing()
         
-        # Directly call the generate_briefing method
-        engine.generate_briefing()
-        
-        logger.info("✅ Briefing Generated! Check AI_Employee_Vault/Briefing_[Date].md")
+        logger.info(f"✅ Briefing Generated! Check {briefing_file}")
 
     except Exception as e:
         logger.error(f"Error generating briefing: {e}", exc_info=True)
@@ -1,5 +1,6 @@
 import time
 import logging
+import argparse
 import concurrent.futures
 import sys
 import os
@@ -12,10 +13,12 @@ from filesystem_watcher import DropFolderHandler
 from agent_engine import AgentEngine
 from action_engine import ActionEngine as ActionEngineExecutor
 from system_watcher import SystemWatcher
+from flow_control import FlowController
+from control_server import ControlServer
 from watchdog.observers import Observer
 
-def run_filesystem_watcher(vault_path):
-    event_handler = DropFolderHandler(vault_path)
+def run_filesystem_watcher(vault_path, flow=None):
+    event_handler = DropFolderHandler(vault_path, flow=flow)
     observer = Observer()
     input_path = os.path.join(vault_path, 'Input_Dropzone')
     
@@ -29,40 +32,71 @@ def run_filesystem_watcher(vault_path):
     try:
         while True:
             time.sleep(1)
+            if flow:
+                event_handler.drain_backlog()
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
 
-def run_agent_engine(vault_path):
-    engine = AgentEngine(vault_path)
-    engine.run()
-
-def run_action_engine(vault_path):
-    action_engine = ActionEngineExecutor(vault_path)
+def run_action_engine(vault_path, flow=None):
+    action_engine = ActionEngineExecutor(vault_path, flow=flow)
     action_engine.run()
 
-def run_system_watcher(vault_path):
-    system_watcher = SystemWatcher(vault_path)
+def run_system_watcher(vault_path, flow=None):
+    system_watcher = SystemWatcher(os.path.join(vault_path, 'Needs_Action'), flow=flow)
     system_watcher.run()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Personal AI Employee orchestrator.")
+    parser.add_argument("--vault", action="append", dest="vaults", metavar="PATH",
+                        help="Serve this vault; repeat for multi-vault mode (default: the repo vault only)")
+    parser.add_argument("--llm-workers", type=int, default=4, help="Shared plan-generation workers (multi-vault)")
+    parser.add_argument("--action-workers", type=int, default=2, help="Shared action/email workers (multi-vault)")
+    parser.add_argument("--tenant-inflight", type=int, default=2,
+                        help="Default per-vault in-flight quota; a vault's .env TENANT_MAX_INFLIGHT overrides it")
+    return parser.parse_args()
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+    args = parse_args()
+
+    if args.vaults:
+        from tenancy import MultiVaultOrchestrator
+
+        logging.info(f"🚀 Starting Personal AI Employee System for {len(args.vaults)} vault(s)...")
+        try:
+            orchestrator = MultiVaultOrchestrator(args.vaults, llm_workers=args.llm_workers,
+                                                  action_workers=args.action_workers, max_inflight=args.tenant_inflight)
+        except ValueError as e:
+            logging.error(f"❌ {e}")
+            sys.exit(2)
+        orchestrator.run()
+        sys.exit(0)
     
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
     logging.info("🚀 Starting Personal AI Employee System...")
     logging.info(f"📂 Vault Root: {BASE_DIR}")
 
+    # Shared backpressure between watcher -> agent -> action
+    flow = FlowController(BASE_DIR)
+
+    # The agent is built up-front so the control API can reuse it (briefings, metrics)
+    engine = AgentEngine(BASE_DIR, flow=flow)
+    control = ControlServer(BASE_DIR, engine, flow)
+    control.start()
+
     with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
         # Start the components
-        executor.submit(run_filesystem_watcher, BASE_DIR)
-        executor.submit(run_agent_engine, BASE_DIR)
-        executor.submit(run_action_engine, BASE_DIR)
-        executor.submit(run_system_watcher, BASE_DIR)
+        executor.submit(run_filesystem_watcher, BASE_DIR, flow)
+        executor.submit(engine.run)
+        executor.submit(run_action_engine, BASE_DIR, flow)
+        executor.submit(run_system_watcher, BASE_DIR, flow)
         
         try:
             # Keep main thread alive
             while True:
                 time.sleep(1)
         except KeyboardInterrupt:
-            logging.info("🛑 Shutting down system...")
\ No newline at end of file
+            logging.info("🛑 Shutting down system...")
+            control.stop()
\ No newline at end of file
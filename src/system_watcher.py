@@ -7,8 +7,9 @@ import datetime
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class SystemWatcher:
-    def __init__(self, needs_action_dir="AI_Employee_Vault/Needs_Action"):
+    def __init__(self, needs_action_dir="AI_Employee_Vault/Needs_Action", flow=None):
         self.needs_action_dir = Path(needs_action_dir)
+        self.flow = flow
         self.needs_action_dir.mkdir(exist_ok=True)
 
     def run(self):
@@ -18,6 +19,10 @@ class SystemWatcher:
             ram_usage = psutil.virtual_memory().percent
             logging.info(f"System Watcher Active... CPU: {cpu_usage}%, RAM: {ram_usage}%")
 
+            if self.flow:
+                self.flow.report_load(cpu_usage, ram_usage)
+                self.flow.report()
+
             if cpu_usage > 90.0 or ram_usage > 90.0:
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 alert_file_path = self.needs_action_dir / f"ALERT_High_Load_{timestamp}.txt"
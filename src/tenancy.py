@@ -0,0 +1,232 @@
+import os
+import logging
+import threading
+import concurrent.futures
+from pathlib import Path
+from dotenv import dotenv_values
+from watchdog.observers import Observer
+
+from filesystem_watcher import DropFolderHandler
+from agent_engine import AgentEngine, BRIEFING_TRIGGER
+from action_engine import ActionEngine
+from system_watcher import SystemWatcher
+from flow_control import FlowController, env_number
+from control_server import ControlServer
+from triage_engine import TriageEngine
+
+
+class Tenant:
+    """One vault served by the shared multi-vault orchestrator."""
+
+    def __init__(self, name, vault_path, agent, action, flow, handler, max_inflight):
+        self.vault_path = Path(vault_path)
+        self.name = name
+        self.agent = agent
+        self.action = action
+        self.flow = flow
+        self.handler = handler
+        self.max_inflight = max_inflight
+        self.control = None
+        self.inflight = set()          # task files (and the briefing trigger) handed to the LLM pool
+        self.actions_inflight = set()  # plan files handed to the action pool
+        self.metrics = {"plans": 0, "briefings": 0, "actions": 0, "errors": 0}
+        self.lock = threading.Lock()
+
+    def count(self, key):
+        with self.lock:
+            self.metrics[key] += 1
+
+
+class MultiVaultOrchestrator:
+    """Serves many vaults from one process with shared watchers, LLM and action pools."""
+
+    def __init__(self, vault_paths, llm_workers=4, action_workers=2, max_inflight=2, check_interval=5):
+        self.logger = logging.getLogger('MultiVault')
+        self.check_interval = check_interval
+        self.llm_workers = llm_workers
+        self.action_workers = action_workers
+        self.llm_pool = concurrent.futures.ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix='llm')
+        self.action_pool = concurrent.futures.ThreadPoolExecutor(max_workers=action_workers, thread_name_prefix='action')
+        self.observer = Observer()
+        self.tenants = []
+        self._next_tenant = 0
+        self._wake = threading.Event()  # set whenever pooled work finishes
+
+        paths = [Path(p).resolve() for p in vault_paths]
+        duplicates = sorted({str(p) for p in paths if paths.count(p) > 1})
+        if duplicates:
+            raise ValueError(f"Vault listed more than once: {', '.join(duplicates)}")
+
+        # Each vault's .env is read with dotenv_values so its settings never leak into os.environ
+        # (and from there into other vaults). Gemini and SendGrid clients are bound to their API
+        # key, so vaults only share a client when they use the same key.
+        triage = TriageEngine(confidence_threshold=env_number("TRIAGE_CONFIDENCE", 0.85, float))
+        models = {}           # GEMINI_API_KEY -> (model, model_name)
+        sendgrid_clients = {}  # SENDGRID_API_KEY -> client
+        for path in paths:
+            env_path = path / '.env'
+            settings = dotenv_values(env_path) if env_path.exists() else {}
+            flow = FlowController(path, settings=settings)
+
+            gemini_key = settings.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
+            if gemini_key in models:
+                model, model_name = models[gemini_key]
+                agent = AgentEngine(path, flow=flow, model=model, model_name=model_name, triage=triage, settings=settings)
+            else:
+                agent = AgentEngine(path, flow=flow, triage=triage, settings=settings)
+                models[gemini_key] = (agent.model, agent.model_name)
+
+            sendgrid_key = settings.get("SENDGRID_API_KEY") or os.getenv("SENDGRID_API_KEY")
+            action = ActionEngine(path, flow=flow, sendgrid_client=sendgrid_clients.get(sendgrid_key), settings=settings)
+            if action.sg is not None:
+                sendgrid_clients.setdefault(sendgrid_key, action.sg)
+
+            quota = max(1, env_number("TENANT_MAX_INFLIGHT", max_inflight, int, settings))
+            tenant = Tenant(self._unique_name(path), path, agent, action, flow, DropFolderHandler(path, flow=flow), quota)
+            self.tenants.append(tenant)
+
+            input_path = path / 'Input_Dropzone'
+            input_path.mkdir(exist_ok=True)
+            self.observer.schedule(tenant.handler, str(input_path), recursive=False)
+            self.logger.info(f"🏢 Tenant '{tenant.name}' registered (quota: {tenant.max_inflight} in-flight): {path}")
+
+    def _unique_name(self, path):
+        """Vault folder name, qualified with its parent when another tenant already uses it."""
+        taken = {t.name for t in self.tenants}
+        for name in (path.name, f"{path.parent.name}/{path.name}"):
+            if name not in taken:
+                return name
+        return str(path)
+
+    def _fair_share(self, queues, capacity):
+        """Deals out up to `capacity` items one per tenant per round, rotating who goes first."""
+        order = self.tenants[self._next_tenant:] + self.tenants[:self._next_tenant]
+        self._next_tenant = (self._next_tenant + 1) % len(self.tenants)
+        picked = []
+        while capacity > 0 and any(queues.get(t) for t in order):
+            for tenant in order:
+                if capacity > 0 and queues.get(tenant):
+                    picked.append((tenant, queues[tenant].pop(0)))
+                    capacity -= 1
+        return picked
+
+    def _agent_queue(self, tenant):
+        if not tenant.flow.agent_open():
+            return []
+        items = [BRIEFING_TRIGGER] if tenant.agent.briefing_requested() else []
+        items = [f for f in items + tenant.agent.pending_tasks() if f not in tenant.inflight]
+        if not items:
+            return []
+        allowed = min(tenant.max_inflight, tenant.flow.llm_concurrency()) - len(tenant.inflight)
+        allowed = min(allowed, tenant.flow.plan_capacity() - len(tenant.inflight))
+        return items[:max(allowed, 0)]
+
+    def _run_task(self, tenant, file):
+        try:
+            if file == BRIEFING_TRIGGER:
+                tenant.agent.run_briefing_trigger()
+                tenant.count("briefings")
+            else:
+                tenant.agent.process_file(file)
+                tenant.count("plans")
+        except Exception as e:
+            tenant.count("errors")
+            self.logger.error(f"[{tenant.name}] Error processing {file}: {e}", exc_info=True)
+        finally:
+            with tenant.lock:
+                tenant.inflight.discard(file)
+
+    def _run_plan(self, tenant, plan_path):
+        try:
+            tenant.action.process_plan(plan_path)
+            tenant.count("actions")
+        except Exception as e:
+            tenant.count("errors")
+            self.logger.error(f"[{tenant.name}] Error executing {plan_path.name}: {e}", exc_info=True)
+        finally:
+            with tenant.lock:
+                tenant.actions_inflight.discard(plan_path.name)
+
+    def _collect(self, build_queue):
+        queues = {}
+        for tenant in self.tenants:
+            try:
+                queues[tenant] = build_queue(tenant)
+            except Exception as e:
+                self.logger.error(f"[{tenant.name}] Failed to scan vault: {e}")
+        return queues
+
+    def _submit(self, pool, fn, *args):
+        # Wake the scheduler as soon as a worker frees up so the pools are topped up immediately
+        pool.submit(fn, *args).add_done_callback(lambda _: self._wake.set())
+
+    def schedule_agents(self):
+        busy = sum(len(t.inflight) for t in self.tenants)
+        for tenant, file in self._fair_share(self._collect(self._agent_queue), self.llm_workers - busy):
+            with tenant.lock:
+                tenant.inflight.add(file)
+            self._submit(self.llm_pool, self._run_task, tenant, file)
+
+    def schedule_actions(self):
+        def action_queue(tenant):
+            plans = [p for p in tenant.action.pending_plans() if p.name not in tenant.actions_inflight]
+            return plans[:max(tenant.max_inflight - len(tenant.actions_inflight), 0)]
+
+        busy = sum(len(t.actions_inflight) for t in self.tenants)
+        for tenant, plan_path in self._fair_share(self._collect(action_queue), self.action_workers - busy):
+            with tenant.lock:
+                tenant.actions_inflight.add(plan_path.name)
+            self._submit(self.action_pool, self._run_plan, tenant, plan_path)
+
+    def report_load(self, cpu, ram):
+        """SystemWatcher hook: one host reading drives every tenant's load gate."""
+        for tenant in self.tenants:
+            tenant.flow.report_load(cpu, ram)
+
+    def metrics(self):
+        result = {}
+        for tenant in self.tenants:
+            with tenant.lock:
+                counters = dict(tenant.metrics, inflight=len(tenant.inflight), actions_inflight=len(tenant.actions_inflight))
+            result[tenant.name] = dict(counters, queues=tenant.flow.snapshot()['depths'])
+        return result
+
+    def report(self):
+        """SystemWatcher hook: logs per-tenant metrics and queue depths."""
+        for tenant in self.tenants:
+            tenant.flow.refresh()
+        for name, m in self.metrics().items():
+            queues = ", ".join(f"{k}={v}" for k, v in m['queues'].items())
+            self.logger.info(f"📊 [{name}] plans={m['plans']} briefings={m['briefings']} actions={m['actions']} errors={m['errors']} "
+                             f"inflight={m['inflight']}/{m['actions_inflight']} | {queues}")
+
+    def run(self):
+        self.observer.start()
+        for tenant in self.tenants:
+            tenant.control = ControlServer(tenant.vault_path, tenant.agent, tenant.flow)
+            tenant.control.start()
+
+        # One host-level health monitor; alerts land in the first vault
+        system_watcher = SystemWatcher(self.tenants[0].vault_path / 'Needs_Action', flow=self)
+        threading.Thread(target=system_watcher.run, name='SystemWatcher', daemon=True).start()
+
+        self.logger.info(f"🚀 Serving {len(self.tenants)} vault(s) with {self.llm_workers} LLM and {self.action_workers} action workers.")
+        try:
+            while True:
+                for tenant in self.tenants:
+                    tenant.handler.drain_backlog()
+                self.schedule_agents()
+                self.schedule_actions()
+                # Sleep until a worker finishes, or poll again after check_interval
+                self._wake.wait(self.check_interval)
+                self._wake.clear()
+        except KeyboardInterrupt:
+            self.logger.info("🛑 Shutting down multi-vault orchestrator...")
+        finally:
+            self.observer.stop()
+            self.observer.join()
+            for tenant in self.tenants:
+                if tenant.control:
+                    tenant.control.stop()
+            self.llm_pool.shutdown(wait=False, cancel_futures=True)
+            self.action_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,279 @@
+import os
+import re
+import math
+import zlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+
+# Try importing the local classifier backend (CPU only)
+try:
+    import torch
+    import torch.nn as nn
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+LOCAL_CLASSES = ["system_alert", "log_file", "data_table"]
+REMOTE_CLASS = "needs_reasoning"
+CLASSES = LOCAL_CLASSES + [REMOTE_CLASS]
+
+TEXT_EXTENSIONS = ('.txt', '.md', '.csv', '.py', '.js', '.log', '.json', '.tsv')
+KNOWN_EXTENSIONS = ['.txt', '.md', '.csv', '.tsv', '.log', '.json', '.py', '.js']
+DELIMITED_EXTENSIONS = ('.csv', '.tsv')
+SENSITIVE_KEYWORDS = ("confidential", "private", "contract", "invoice")
+
+NAME_BUCKETS = 32
+CONTENT_BUCKETS = 128
+NUMERIC_FEATURES = 4
+FEATURE_SIZE = len(KNOWN_EXTENSIONS) + 1 + NAME_BUCKETS + CONTENT_BUCKETS + NUMERIC_FEATURES
+
+# Seed examples the classifier is fitted on at startup: (filename, content, label)
+SEED_EXAMPLES = [
+    ("ALERT_High_Load_20260201_101500.txt", "Warning: High System Resource Usage detected!\nCPU: 97.1%\nRAM: 64.0%", "system_alert"),
+    ("ALERT_High_Load_20260203_230102.txt", "Warning: High System Resource Usage detected!\nCPU: 41.0%\nRAM: 93.5%", "system_alert"),
+    ("cpu_alert.txt", "Warning: high load detected on host. CPU: 99% RAM: 91%", "system_alert"),
+    ("server.log", "2026-02-01 10:00:01 INFO started\n2026-02-01 10:00:02 WARNING slow response\n2026-02-01 10:00:05 ERROR timeout", "log_file"),
+    ("app_output.txt", "[INFO] worker 1 ready\n[INFO] worker 2 ready\n[DEBUG] heartbeat ok\n[ERROR] connection reset", "log_file"),
+    ("build.log", "Traceback (most recent call last):\n  File \"main.py\", line 3\nValueError: bad input\nINFO retrying", "log_file"),
+    ("sales_export.csv", "date,product,qty,price\n2026-01-01,widget,3,9.99\n2026-01-02,gadget,1,19.50\n2026-01-03,widget,7,9.99", "data_table"),
+    ("inventory.tsv", "sku\tname\tstock\n1001\tbolt\t250\n1002\tnut\t900\n1003\twasher\t120", "data_table"),
+    ("metrics.csv", "week,visits,signups\n5,1200,31\n6,1350,40\n7,1410,38", "data_table"),
+    ("meeting_notes.txt", "Call with the client tomorrow about the new website. Please draft a reply and propose three dates.", "needs_reasoning"),
+    ("idea.md", "We should launch a newsletter for our customers. Outline a plan and first steps.", "needs_reasoning"),
+    ("request.txt", "Hi, can you prepare a proposal for Project Bravo and reach out to the marketing lead?", "needs_reasoning"),
+    ("script.py", "def main():\n    print('hello')\n\nif __name__ == '__main__':\n    main()", "needs_reasoning"),
+    ("todo.txt", "Research competitor pricing and summarize the key differences for the team.", "needs_reasoning"),
+]
+
+
+def _bucket(token, buckets):
+    return zlib.crc32(token.encode('utf-8')) % buckets
+
+
+def _tokens(text):
+    return [t for t in re.split(r'[^a-z0-9]+', text.lower()) if t and not t.isdigit()]
+
+
+def extract_features(filename, content):
+    """Builds a fixed-size feature vector from filename, file type and content."""
+    vec = [0.0] * FEATURE_SIZE
+    ext = os.path.splitext(filename)[1].lower()
+    ext_index = KNOWN_EXTENSIONS.index(ext) if ext in KNOWN_EXTENSIONS else len(KNOWN_EXTENSIONS)
+    vec[ext_index] = 1.0
+
+    offset = len(KNOWN_EXTENSIONS) + 1
+    for token in _tokens(os.path.splitext(filename)[0]):
+        vec[offset + _bucket(token, NAME_BUCKETS)] = 1.0
+
+    offset += NAME_BUCKETS
+    sample = content[:2000]
+    content_tokens = _tokens(sample)
+    for token in content_tokens:
+        vec[offset + _bucket(token, CONTENT_BUCKETS)] += 1.0
+    total = sum(vec[offset:offset + CONTENT_BUCKETS]) or 1.0
+    for i in range(offset, offset + CONTENT_BUCKETS):
+        vec[i] /= total
+
+    offset += CONTENT_BUCKETS
+    length = max(len(sample), 1)
+    lines = sample.splitlines() or [""]
+    vec[offset] = sum(c.isdigit() for c in sample) / length
+    vec[offset + 1] = (sample.count(',') + sample.count('\t')) / length * 10
+    vec[offset + 2] = min(len(lines) / 50.0, 1.0)
+    vec[offset + 3] = math.log1p(len(content)) / 10.0
+    return vec
+
+
+class TriageDecision:
+    def __init__(self, label, confidence, source, reason=""):
+        self.label = label
+        self.confidence = confidence
+        self.source = source  # "rule" or "classifier"
+        self.reason = reason
+
+    @property
+    def local(self):
+        return self.label in LOCAL_CLASSES
+
+
+class TriageStats:
+    """Routing counters. Each AgentEngine keeps its own so a shared TriageEngine still reports per vault."""
+
+    def __init__(self):
+        self.counts = {"local": 0, "remote": 0}
+        self.class_counts = {label: 0 for label in CLASSES}
+        self.confidence_total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, decision):
+        """Counts one decision and returns the running total."""
+        with self._lock:
+            self.counts["local" if decision.local else "remote"] += 1
+            self.class_counts[decision.label] += 1
+            self.confidence_total += decision.confidence
+            return sum(self.counts.values())
+
+    def snapshot(self):
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                "total": total,
+                "local": self.counts["local"],
+                "remote": self.counts["remote"],
+                "local_ratio": round(self.counts["local"] / total, 3) if total else 0.0,
+                "avg_confidence": round(self.confidence_total / total, 3) if total else 0.0,
+                "classes": dict(self.class_counts),
+            }
+
+
+class TriageEngine:
+    """Routes trivial Needs_Action items to templated plans so they never reach Gemini."""
+
+    def __init__(self, confidence_threshold=None, stats_every=10):
+        self.logger = logging.getLogger('TriageEngine')
+        if confidence_threshold is None:
+            confidence_threshold = os.getenv("TRIAGE_CONFIDENCE", "0.85")
+        self.confidence_threshold = float(confidence_threshold)
+        self.stats_every = stats_every
+        self.model = None
+        self.totals = TriageStats()  # across every caller of this engine
+
+        if TORCH_AVAILABLE:
+            try:
+                self.model = self._fit_classifier()
+                self.logger.info("🧮 Local triage classifier ready (CPU).")
+            except Exception as e:
+                self.logger.warning(f"Triage classifier unavailable, using rules only: {e}")
+        else:
+            self.logger.warning("torch not found. Triage will use rules only.")
+
+    def _fit_classifier(self, epochs=300):
+        torch.manual_seed(0)
+        x = torch.tensor([extract_features(n, c) for n, c, _ in SEED_EXAMPLES], dtype=torch.float32)
+        y = torch.tensor([CLASSES.index(label) for _, _, label in SEED_EXAMPLES])
+        model = nn.Linear(FEATURE_SIZE, len(CLASSES))
+        optimizer = torch.optim.Adam(model.parameters(), lr=0.05, weight_decay=1e-3)
+        loss_fn = nn.CrossEntropyLoss()
+        model.train()
+        for _ in range(epochs):
+            optimizer.zero_grad()
+            loss = loss_fn(model(x), y)
+            loss.backward()
+            optimizer.step()
+        model.eval()
+        return model
+
+    def _apply_rules(self, filename, content):
+        lowered = f"{filename}\n{content[:5000]}".lower()
+        if any(keyword in lowered for keyword in SENSITIVE_KEYWORDS):
+            return TriageDecision(REMOTE_CLASS, 1.0, "rule", "sensitive content")
+        if not filename.lower().endswith(TEXT_EXTENSIONS):
+            return TriageDecision(REMOTE_CLASS, 1.0, "rule", "unsupported or binary type")
+        if filename.startswith("ALERT_High_Load_") and filename.endswith(".txt"):
+            return TriageDecision("system_alert", 1.0, "rule", "SystemWatcher alert")
+        return None
+
+    def classify(self, file_path, confidence_threshold=None, stats=None):
+        """Returns a TriageDecision for a file sitting in In_Progress.
+
+        `confidence_threshold` overrides the engine default and `stats` receives the decision as well
+        as the engine totals, e.g. per vault when the engine is shared.
+        """
+        if confidence_threshold is None:
+            confidence_threshold = self.confidence_threshold
+        file_path = Path(file_path)
+        filename = file_path.name
+        content = ""
+        if filename.lower().endswith(TEXT_EXTENSIONS):
+            try:
+                content = file_path.read_text(encoding='utf-8', errors='ignore')
+            except Exception as e:
+                self.logger.warning(f"Could not read {filename} for triage: {e}")
+
+        decision = self._apply_rules(filename, content)
+        if decision is None:
+            decision = TriageDecision(REMOTE_CLASS, 0.0, "classifier", "no classifier available")
+            if self.model is not None:
+                with torch.no_grad():
+                    features = torch.tensor([extract_features(filename, content)], dtype=torch.float32)
+                    probs = torch.softmax(self.model(features), dim=1)[0]
+                confidence, index = torch.max(probs, dim=0)
+                decision = TriageDecision(CLASSES[int(index)], float(confidence), "classifier")
+                if decision.local and decision.confidence < confidence_threshold:
+                    decision.reason = f"low confidence for {decision.label}"
+                    decision.label = REMOTE_CLASS
+                elif decision.label == "data_table" and not filename.lower().endswith(DELIMITED_EXTENSIONS):
+                    # The table template only understands delimited rows
+                    decision.reason = "data_table template needs .csv/.tsv"
+                    decision.label = REMOTE_CLASS
+
+        self._record(filename, decision, stats)
+        return decision
+
+    def _record(self, filename, decision, stats=None):
+        route = "local" if decision.local else "remote"
+        total = self.totals.record(decision)
+        if stats is not None and stats is not self.totals:
+            stats.record(decision)
+        self.logger.info(f"🔀 Triage {filename}: {route} ({decision.label}, {decision.source}, confidence {decision.confidence:.2f})")
+        if total % self.stats_every == 0:
+            self.logger.info(f"📈 Triage stats: {self.stats()}")
+
+    def stats(self):
+        return self.totals.snapshot()
+
+    def render_plan(self, file_path, decision):
+        """Builds a templated Plan.md for a locally triaged file."""
+        file_path = Path(file_path)
+        filename = file_path.name
+        try:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
+        except Exception:
+            content = ""
+
+        if decision.label == "system_alert":
+            cpu = re.search(r'CPU:\s*([\d.]+)%', content)
+            ram = re.search(r'RAM:\s*([\d.]+)%', content)
+            body = f"""# Objective
+Investigate high system load flagged in **{filename}**.
+- CPU: {cpu.group(1) + '%' if cpu else 'n/a'}
+- RAM: {ram.group(1) + '%' if ram else 'n/a'}
+# Proposed Actions
+- [ ] Check the top CPU / memory consuming processes
+- [ ] Stop or restart runaway processes if safe
+- [ ] Archive this alert once load is back to normal
+# Approval
+Move this plan to /Approved to archive the alert."""
+        elif decision.label == "log_file":
+            lines = content.splitlines()
+            errors = sum(1 for line in lines if re.search(r'\b(error|exception|traceback|critical)\b', line, re.IGNORECASE))
+            warns = sum(1 for line in lines if re.search(r'\bwarn(ing)?\b', line, re.IGNORECASE))
+            body = f"""# Objective
+Review log file **{filename}** ({len(lines)} lines).
+- Error lines: {errors}
+- Warning lines: {warns}
+# Proposed Actions
+- [ ] Inspect the error lines for recurring failures
+- [ ] Open a follow-up task if any failure needs a fix
+- [ ] Archive the log file
+# Approval
+Move this plan to /Approved to archive the log."""
+        else:
+            lines = [line for line in content.splitlines() if line.strip()]
+            delimiter = '\t' if lines and '\t' in lines[0] else ','
+            columns = [c.strip() for c in lines[0].split(delimiter)] if lines else []
+            body = f"""# Objective
+Validate and file the data table **{filename}**.
+- Rows: {max(len(lines) - 1, 0)}
+- Columns: {', '.join(columns) if columns else 'n/a'}
+# Proposed Actions
+- [ ] Spot-check rows for missing or malformed values
+- [ ] Archive the table with the rest of the business records
+# Approval
+Move this plan to /Approved to archive the table."""
+
+        date_str = datetime.now().strftime("%Y-%m-%d %H:%M")
+        return (f"---\nstatus: Pending Approval\ndate: {date_str}\ntarget_file: {filename}\n"
+                f"triage: local\ntriage_class: {decision.label}\nconfidence: {decision.confidence:.2f}\n---\n\n{body}")